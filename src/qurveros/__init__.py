@@ -2,3 +2,12 @@ from qurveros import settings
 import jax
 jax.config.update("jax_enable_x64", True)
 jax.config.update("jax_debug_nans", True)
+
+# The persistent compilation cache avoids recompiling the jitted losses
+# and optimization steps in every session. It is enabled by setting
+# JAX_COMPILATION_CACHE_DIR in qurveros_settings.json.
+_cache_dir = settings.settings.options.get('JAX_COMPILATION_CACHE_DIR')
+
+if _cache_dir is not None:
+    jax.config.update("jax_compilation_cache_dir", _cache_dir)
+    jax.config.update("jax_persistent_cache_min_compile_time_secs", 0)
@@ -5,11 +5,12 @@ optimization methods for the auxiliary parameters.
 The BarqCurve class is also defined in this module.
 """
 
+import functools
+
 import jax
 import jax.numpy as jnp
 import numpy
 import optax
-import pandas as pd
 import warnings
 import logging
 
@@ -47,8 +48,16 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
                  deriv_array_fun=None):
 
         self.opt_loss = None
-        self.params_history = None
         self.loss_grad = lambda params: None
+        self._loss_value_and_grad = None
+        self._loss_value_and_grad_vmap = None
+        self._params_history_stacked = None
+        self._params_history_list = None
+        self._chunk_runner_cache = {}
+        self._default_optimizer = None
+        self._x_values_cache = {}
+        self._prepared_loss_cache = {}
+        self._recovery_key = None
 
         super().__init__(curve=curve,
                          order=order,
@@ -83,55 +92,140 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
         if interval is None:
             interval = self.interval
 
-        x_values = jnp.linspace(*interval, settings.options['OPT_POINTS'])
+        # The grid only depends on the interval and the number of points.
+        # The key is normalized to static hashable values so that
+        # OPT_POINTS round-trips (e.g. through the settings file) reuse
+        # the device-resident grid instead of re-tracing the loss over a
+        # fresh one.
+        grid_key = (float(interval[0]), float(interval[1]),
+                    int(settings.options['OPT_POINTS']))
+
+        # The jitted loss set only depends on the grid, the loss functions
+        # and their weights, so a re-preparation with a logically identical
+        # loss list reuses the compiled callables instead of re-tracing
+        # them. The cache entries keep the loss functions alive, so the
+        # identities in the key remain valid.
+        loss_key = grid_key + tuple(
+            (id(loss_fun), float(weight)) for loss_fun, weight in loss_list)
+
+        cached_losses = self._prepared_loss_cache.get(loss_key)
+
+        if cached_losses is not None:
+
+            # The loss gradient is unchanged, so the cached chunk runners
+            # that close over it remain valid and are kept.
+            (self.opt_loss, self.loss_grad, self._loss_value_and_grad,
+             self._loss_value_and_grad_vmap) = cached_losses
+
+            return
+
+        if grid_key not in self._x_values_cache:
+            self._x_values_cache[grid_key] = jnp.linspace(*grid_key)
+
+        x_values = self._x_values_cache[grid_key]
+
+        loss_funs = [loss_fun for loss_fun, _ in loss_list]
+        weights = jnp.array([weight for _, weight in loss_list])
 
         @jax.jit
         def opt_loss(params):
 
             frenet_dict = self._frenet_dict_fun(x_values, params)
 
-            loss = 0.
-            for loss_fun, weight in loss_list:
-                loss = loss + weight * loss_fun(frenet_dict)
+            loss_values = jnp.stack(
+                [loss_fun(frenet_dict) for loss_fun in loss_funs])
 
-            return loss
+            return jnp.dot(weights, loss_values)
 
         self.opt_loss = opt_loss
         self.loss_grad = jax.jit(jax.grad(self.opt_loss))
 
+        # The history queries in __getitem__ evaluate the loss and its
+        # gradient together, so the forward pass (and the frenet_dict it
+        # computes) is shared instead of being evaluated twice. The
+        # callables are jitted once here to avoid retracing on each query.
+        self._loss_value_and_grad = jax.jit(jax.value_and_grad(opt_loss))
+        self._loss_value_and_grad_vmap = jax.jit(
+            jax.vmap(jax.value_and_grad(opt_loss)))
+
+        self._prepared_loss_cache[loss_key] = (
+            self.opt_loss, self.loss_grad, self._loss_value_and_grad,
+            self._loss_value_and_grad_vmap)
+
+        # The cached chunk runners close over the previous loss gradient.
+        self._chunk_runner_cache = {}
+
+    def _params_finite(self, params, validation_keys=None):
+        """
+        Computes an in-graph flag for the finiteness of the parameters.
+        The function is traceable so it can be used inside jitted code.
+
+        Args:
+            params: Parameter tree to validate
+            validation_keys: List of keys to validate. If None, validates all
+            parameters.
+
+        Returns:
+            A scalar boolean array. True if the specified parameters are
+            finite, False otherwise.
+
+        Note:
+            The probe maps Inf to NaN by design, so this check must only
+            run inside jitted code, where the intermediate NaN stays
+            internal to the computation and the jax_debug_nans
+            configuration only inspects the (boolean) outputs. Host-side
+            callers use _is_params_valid instead.
+        """
+
+        if validation_keys is not None and isinstance(params, dict):
+            params = {key: params[key] for key in validation_keys
+                      if key in params}
+
+        def probe_leaf(x):
+            # Multiplying by zero maps every finite value exactly to zero
+            # while NaN and Inf propagate, so each leaf collapses to a
+            # single sum (which cannot overflow for finite leaves) and
+            # the whole check to one isfinite on a scalar.
+            return jnp.sum(x * 0.0)
+
+        probes = jax.tree_util.tree_map(probe_leaf, params)
+
+        # The associative reduction builds an O(log N)-depth graph over the
+        # leaves, which keeps the compile time low for parameter trees with
+        # many leaves.
+        if hasattr(jax.tree_util, 'tree_reduce_associative'):
+            total = jax.tree_util.tree_reduce_associative(
+                jnp.add, probes, identity=jnp.array(0.))
+        else:
+            total = jax.tree_util.tree_reduce(
+                jnp.add, probes, jnp.array(0.))
+
+        return jnp.isfinite(total)
+
     def _is_params_valid(self, params, validation_keys=None):
         """
         Checks if parameters contain NaN or infinite values.
-        
+
         Args:
             params: Parameter tree to validate
             validation_keys: List of keys to validate. If None, validates all parameters.
-            
+
         Returns:
             bool: True if specified parameters are finite, False otherwise
+
+        Note:
+            This host-side check uses the plain isfinite reduction. The
+            zero-multiplication probe in _params_finite turns Inf into
+            NaN, which would abort an eager caller under the package's
+            jax_debug_nans configuration.
         """
-        def is_finite_leaf(x):
-            return jnp.all(jnp.isfinite(x))
-        
-        if validation_keys is None:
-            # Validate all parameters
-            finite_flags = jax.tree_util.tree_map(is_finite_leaf, params)
-            return jax.tree_util.tree_reduce(jnp.logical_and, finite_flags, True)
-        else:
-            # Validate only specified keys
-            if isinstance(params, dict):
-                for key in validation_keys:
-                    if key in params:
-                        param_subset = params[key]
-                        finite_flags = jax.tree_util.tree_map(is_finite_leaf, param_subset)
-                        is_valid = jax.tree_util.tree_reduce(jnp.logical_and, finite_flags, True)
-                        if not is_valid:
-                            return False
-                return True
-            else:
-                # For non-dict params, validate all if keys are specified
-                finite_flags = jax.tree_util.tree_map(is_finite_leaf, params)
-                return jax.tree_util.tree_reduce(jnp.logical_and, finite_flags, True)
+
+        if validation_keys is not None and isinstance(params, dict):
+            params = {key: params[key] for key in validation_keys
+                      if key in params}
+
+        return all(bool(jnp.all(jnp.isfinite(leaf)))
+                   for leaf in jax.tree_util.tree_leaves(params))
 
     def _create_perturbed_params(self, base_params, magnitude, rng_key, validation_keys=None):
         """
@@ -146,45 +240,87 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
         Returns:
             Perturbed parameter tree
         """
-        def add_noise_to_leaf(leaf, key):
-            noise = jax.random.normal(key, leaf.shape) * magnitude
-            return leaf + noise
-        
-        if validation_keys is None:
+        def perturb_tree(tree, tree_key):
+
+            # Each leaf derives its key by folding the leaf index into the
+            # tree key, avoiding the key-split and unflatten round-trip.
+            leaves, treedef = jax.tree_util.tree_flatten(tree)
+
+            perturbed_leaves = [
+                leaf + magnitude * jax.random.normal(
+                    jax.random.fold_in(tree_key, idx), jnp.shape(leaf))
+                for idx, leaf in enumerate(leaves)]
+
+            return jax.tree_util.tree_unflatten(treedef, perturbed_leaves)
+
+        if validation_keys is None or not isinstance(base_params, dict):
             # Perturb all parameters
-            treedef = jax.tree_util.tree_structure(base_params)
-            num_leaves = treedef.num_leaves
-            keys = jax.random.split(rng_key, num_leaves)
-            
-            perturbed_params = jax.tree_util.tree_map(
-                add_noise_to_leaf, base_params, 
-                jax.tree_util.tree_unflatten(treedef, keys)
-            )
-            return perturbed_params
-        else:
-            # Perturb only specified keys
-            if isinstance(base_params, dict):
-                perturbed_params = dict(base_params)  # Copy base params
-                
-                for i, key in enumerate(validation_keys):
-                    if key in base_params:
-                        key_rng = jax.random.fold_in(rng_key, i)
-                        param_subset = base_params[key]
-                        
-                        treedef = jax.tree_util.tree_structure(param_subset)
-                        num_leaves = treedef.num_leaves
-                        keys = jax.random.split(key_rng, num_leaves)
-                        
-                        perturbed_subset = jax.tree_util.tree_map(
-                            add_noise_to_leaf, param_subset,
-                            jax.tree_util.tree_unflatten(treedef, keys)
-                        )
-                        perturbed_params[key] = perturbed_subset
-                        
-                return perturbed_params
-            else:
-                # For non-dict params, perturb all if keys are specified
-                return self._create_perturbed_params(base_params, magnitude, rng_key, None)
+            return perturb_tree(base_params, rng_key)
+
+        # Perturb only specified keys
+        perturbed_params = dict(base_params)  # Copy base params
+
+        for i, key in enumerate(validation_keys):
+            if key in base_params:
+                perturbed_params[key] = perturb_tree(
+                    base_params[key], jax.random.fold_in(rng_key, i))
+
+        return perturbed_params
+
+    def _run_recovery_attempts(self, base_params, magnitude, rng_key,
+                               max_retries, validation_keys=None):
+        """
+        Runs the perturbation retry attempts in a single fused loop.
+
+        A jax.lax.fori_loop iterates over the attempts and keeps the first
+        finite candidate through a masked jnp.where selection, so the
+        retries execute without a host round-trip per attempt.
+
+        Args:
+            base_params: Valid parameter tree to perturb
+            magnitude: Magnitude of perturbation
+            rng_key: JAX random key; split once into one key per attempt
+            max_retries: Number of perturbation attempts
+            validation_keys: List of keys to perturb and validate
+
+        Returns:
+            A tuple (params, valid_flags). params holds the first finite
+            candidate, or base_params when every attempt failed.
+            valid_flags holds one finiteness flag per attempt.
+        """
+
+        # The per-attempt keys are materialized as a single array so the
+        # loop body only indexes into it.
+        attempt_keys = jax.random.split(rng_key, max_retries)
+
+        def attempt(i, carry):
+            params, valid_flags, found = carry
+
+            candidate = self._create_perturbed_params(
+                base_params, magnitude, attempt_keys[i],
+                validation_keys)
+
+            is_finite = self._params_finite(candidate, validation_keys)
+
+            take = jnp.logical_and(jnp.logical_not(found), is_finite)
+
+            params = jax.tree_util.tree_map(
+                lambda cand_leaf, cur_leaf: jnp.where(
+                    take, cand_leaf, cur_leaf),
+                candidate, params)
+
+            valid_flags = valid_flags.at[i].set(is_finite)
+
+            return params, valid_flags, jnp.logical_or(found, is_finite)
+
+        init_carry = (base_params,
+                      jnp.zeros(max_retries, dtype=bool),
+                      jnp.array(False))
+
+        params, valid_flags, _ = jax.lax.fori_loop(
+            0, max_retries, attempt, init_carry)
+
+        return params, valid_flags
 
     def _log_retry_attempt(self, iteration, retry_count, error_type):
         """
@@ -207,6 +343,96 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
             logger.debug(f"Optimization retry: iter={iteration}, "
                         f"attempt={retry_count}, error={error_type}")
 
+    def _get_chunk_runner(self, optimizer, param_validation_keys):
+
+        """
+        Builds the jitted scan over optimization steps for a given optimizer.
+
+        The runner is cached on the instance so that repeated optimize()
+        calls reuse the compiled step instead of retracing a fresh closure
+        each time. The cache is cleared when a new optimization loss is
+        prepared.
+        """
+
+        if param_validation_keys is not None:
+            param_validation_keys = tuple(param_validation_keys)
+
+        cache_key = (id(optimizer), param_validation_keys)
+
+        # The cached runner closes over the optimizer, which keeps the id
+        # of the key stable for the lifetime of the cache entry.
+        if cache_key in self._chunk_runner_cache:
+            return self._chunk_runner_cache[cache_key]
+
+        def step(carry, iteration):
+
+            (params, opt_state, last_valid_params, last_valid_opt_state,
+             history) = carry
+
+            grads = self.loss_grad(params)
+
+            updates, new_opt_state = optimizer.update(grads, opt_state, params)
+
+            new_params = optax.apply_updates(params, updates)
+
+            is_finite = self._params_finite(new_params, param_validation_keys)
+
+            # The last valid state is substituted in-graph whenever the
+            # update produced non-finite values. The substitution is
+            # unconditional: letting NaNs into the carry or the history
+            # would abort the run under the package's jax_debug_nans
+            # configuration.
+            is_bad = jnp.logical_not(is_finite)
+
+            def recover_leaf(new_leaf, valid_leaf):
+                return jnp.where(is_bad, valid_leaf, new_leaf)
+
+            new_params = jax.tree_util.tree_map(
+                recover_leaf, new_params, last_valid_params)
+            new_opt_state = jax.tree_util.tree_map(
+                recover_leaf, new_opt_state, last_valid_opt_state)
+
+            def track_leaf(new_leaf, valid_leaf):
+                return jnp.where(is_finite, new_leaf, valid_leaf)
+
+            last_valid_params = jax.tree_util.tree_map(
+                track_leaf, new_params, last_valid_params)
+            last_valid_opt_state = jax.tree_util.tree_map(
+                track_leaf, new_opt_state, last_valid_opt_state)
+
+            # The history buffer is carried through the scan so XLA updates
+            # it in place, with row i+1 holding the result of iteration i.
+            history = jax.tree_util.tree_map(
+                lambda buf, leaf: buf.at[iteration + 1].set(leaf),
+                history, new_params)
+
+            carry = (new_params, new_opt_state,
+                     last_valid_params, last_valid_opt_state, history)
+
+            return carry, is_bad
+
+        # Donating the carried buffers lets XLA reuse the parameter,
+        # optimizer state and history allocations in place. Donation is
+        # not supported on the CPU backend.
+        if jax.default_backend() == 'cpu':
+            donate_argnums = ()
+        else:
+            donate_argnums = (0, 1, 2, 3, 4)
+
+        @functools.partial(jax.jit, donate_argnums=donate_argnums)
+        def run_chunk(params, opt_state,
+                      last_valid_params, last_valid_opt_state,
+                      history, iterations):
+            return jax.lax.scan(
+                step,
+                (params, opt_state, last_valid_params, last_valid_opt_state,
+                 history),
+                iterations)
+
+        self._chunk_runner_cache[cache_key] = run_chunk
+
+        return run_chunk
+
     def optimize(self, optimizer=None, max_iter=1000, param_validation_keys=None):
 
         """
@@ -240,28 +466,31 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
             - MAX_OPTIMIZATION_RETRIES: Maximum retry attempts (default: 3)
             - PERTURBATION_MAGNITUDE: Size of parameter perturbation (default: 1e-6)
             - OPTIMIZATION_VERBOSITY: Logging level (default: 0)
-            - NUMERICAL_CHECK_FREQUENCY: Check frequency (default: 1)
+
+        (4) The iterations are fused into chunks of OPT_CHUNK_ITERS steps,
+            each executed as a single jax.lax.scan. The NaN/Inf checks run
+            in-graph inside the scan body on every iteration, where the
+            last valid state is substituted without a host round-trip.
+            Retry warnings and the perturbation-based recovery take place
+            at chunk boundaries.
         """
 
         # Load numerical stability settings
         max_retries = settings.options.get('MAX_OPTIMIZATION_RETRIES', 3)
         perturbation_mag = settings.options.get('PERTURBATION_MAGNITUDE', 1e-6)
         verbosity = settings.options.get('OPTIMIZATION_VERBOSITY', 0)
-        check_freq = settings.options.get('NUMERICAL_CHECK_FREQUENCY', 1)
-        
-        if optimizer is None:
-            optimizer = optax.scale(-0.01)
-
-        @jax.jit
-        def step(params, opt_state):
+        chunk_iters = settings.options.get('OPT_CHUNK_ITERS', 50)
 
-            grads = self.loss_grad(params)
-
-            updates, opt_state = optimizer.update(grads, opt_state, params)
-
-            params = optax.apply_updates(params, updates)
+        if optimizer is None:
+            if self._default_optimizer is None:
+                # The step size enters through a schedule so that it is
+                # read in-graph from the optimizer state instead of being
+                # baked into the compiled step as a constant.
+                self._default_optimizer = optax.chain(
+                    optax.scale_by_schedule(optax.constant_schedule(-0.01)))
+            optimizer = self._default_optimizer
 
-            return params, opt_state
+        run_chunk = self._get_chunk_runner(optimizer, param_validation_keys)
 
         params = self.params
 
@@ -270,92 +499,159 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
                 'The parameters are not set.'
                 ' Use the .initialize_parameters() for initialization.')
 
-        # Initialize numerical stability tracking
-        last_valid_params = params
-        last_valid_opt_state = optimizer.init(params)
-        rng_key = jax.random.PRNGKey(0)
-        
         # Check initial parameters
         if not self._is_params_valid(params, param_validation_keys):
             raise RuntimeError(
                 'Initial parameters contain NaN or infinite values. '
                 'Please check parameter initialization.')
 
+        # The loop works on a copy: set_params stores the caller's tree by
+        # reference, so donating self.params directly would invalidate the
+        # arrays the user passed to initialize_parameters.
+        params = jax.tree_util.tree_map(jnp.array, params)
+
         opt_state = optimizer.init(params)
-        params_history = []
 
-        for iteration in progbar_range(max_iter, title='Optimizing parameters'):
+        # Initialize numerical stability tracking. The copies keep the
+        # initial buffers distinct from the donated optimization state.
+        last_valid_params = jax.tree_util.tree_map(jnp.array, params)
+        last_valid_opt_state = jax.tree_util.tree_map(jnp.array, opt_state)
 
-            # Periodic numerical stability check
-            if iteration % check_freq == 0 and not self._is_params_valid(params, param_validation_keys):
-                
-                recovery_successful = False
-                
-                for retry in range(max_retries):
-                    self._log_retry_attempt(iteration, retry + 1, "NaN/Inf detected")
-                    
-                    # Perturb last valid parameters
-                    rng_key, subkey = jax.random.split(rng_key)
-                    params = self._create_perturbed_params(
-                        last_valid_params, perturbation_mag, subkey, param_validation_keys)
-                    opt_state = last_valid_opt_state
-                    
-                    # Check if perturbation resolved the issue
-                    if self._is_params_valid(params, param_validation_keys):
-                        recovery_successful = True
-                        if verbosity >= 1:
-                            warnings.warn(
-                                f"Successfully recovered from numerical instability "
-                                f"at iteration {iteration} after {retry + 1} attempts.",
-                                RuntimeWarning, stacklevel=2)
-                        break
-                
-                if not recovery_successful:
-                    # All retry attempts failed
-                    error_message = (
-                        f"Critical numerical instability at iteration {iteration}. "
-                        f"Failed to recover after {max_retries} attempts. "
-                        f"Optimization results may be unreliable. "
-                        f"Consider: (1) checking initial parameters, "
-                        f"(2) reducing learning rate, (3) using different optimizer, "
-                        f"(4) increasing PERTURBATION_MAGNITUDE in settings."
-                    )
-                    
-                    if verbosity >= 0:  # Always warn for critical failures
-                        warnings.warn(error_message, RuntimeWarning, stacklevel=2)
-                    
-                    # Continue with last valid parameters as fallback
-                    params = last_valid_params
-                    opt_state = last_valid_opt_state
-
-            params_history.append(params)
-
-            # Perform optimization step
-            try:
-                new_params, new_opt_state = step(params, opt_state)
-                last_valid_params = params
-                last_valid_opt_state = opt_state
-                params = new_params
-                opt_state = new_opt_state
-                    
-            except Exception as e:
-                # Optimization step failed completely
+        # The stacked history buffer is preallocated on the device. Row 0
+        # holds the initial parameters and row i+1 the result of
+        # iteration i.
+        params_history = jax.tree_util.tree_map(
+            lambda leaf: jnp.zeros(
+                (max_iter + 1,) + jnp.shape(leaf),
+                jnp.asarray(leaf).dtype).at[0].set(leaf),
+            params)
+
+        num_chunks = -(-max_iter // chunk_iters)
+
+        for chunk_idx in progbar_range(num_chunks,
+                                       title='Optimizing parameters'):
+
+            chunk_start = chunk_idx * chunk_iters
+            num_steps = min(chunk_iters, max_iter - chunk_start)
+            iterations = jnp.arange(chunk_start, chunk_start + num_steps)
+
+            carry, bad_flags = run_chunk(
+                params, opt_state,
+                last_valid_params, last_valid_opt_state,
+                params_history, iterations)
+
+            (params, opt_state,
+             last_valid_params, last_valid_opt_state,
+             params_history) = carry
+
+            # The in-graph recovery keeps the carried state finite. The
+            # retry perturbation only has to escape a persistently failing
+            # region, once per chunk.
+            bad_flags = numpy.asarray(bad_flags)
+
+            if not bad_flags.any():
+                continue
+
+            first_bad = chunk_start + int(bad_flags.argmax())
+
+            # The recovery key lives on the instance, so it is created once
+            # and threaded across recoveries instead of reseeding a fresh
+            # PRNGKey(0) on every optimize() call.
+            if self._recovery_key is None:
+                self._recovery_key = jax.random.PRNGKey(0)
+
+            self._recovery_key, subkey = jax.random.split(self._recovery_key)
+
+            # All retry attempts run in a single fused loop; the per
+            # attempt validity flags are reported post-hoc.
+            recovered_params, valid_flags = self._run_recovery_attempts(
+                last_valid_params, perturbation_mag, subkey,
+                max_retries, param_validation_keys)
+
+            valid_flags = numpy.asarray(valid_flags)
+            recovery_successful = bool(valid_flags.any())
+
+            if recovery_successful:
+                num_attempts = int(valid_flags.argmax()) + 1
+            else:
+                num_attempts = max_retries
+
+            for retry in range(num_attempts):
+                self._log_retry_attempt(
+                    first_bad, retry + 1, "NaN/Inf detected")
+
+            # The copy keeps the rebound state distinct from the last-valid
+            # buffers, which the next chunk call donates separately.
+            params = recovered_params
+            opt_state = jax.tree_util.tree_map(
+                jnp.array, last_valid_opt_state)
+
+            if recovery_successful:
                 if verbosity >= 1:
                     warnings.warn(
-                        f"Optimization step failed at iteration {iteration}: {e}. "
-                        f"Using last valid parameters.",
+                        f"Successfully recovered from numerical "
+                        f"instability at iteration {first_bad} "
+                        f"after {num_attempts} attempts.",
                         RuntimeWarning, stacklevel=2)
-                # Keep current valid parameters
-                params = last_valid_params
-                opt_state = last_valid_opt_state
 
-        if self._is_params_valid(params, param_validation_keys):
-            params_history.append(params)            
-        else:
-            params_history.append(last_valid_params)
-        self.params_history = params_history
+            else:
+                # All retry attempts failed
+                error_message = (
+                    f"Critical numerical instability at iteration "
+                    f"{first_bad}. "
+                    f"Failed to recover after {max_retries} attempts. "
+                    f"Optimization results may be unreliable. "
+                    f"Consider: (1) checking initial parameters, "
+                    f"(2) reducing learning rate, (3) using different "
+                    f"optimizer, "
+                    f"(4) increasing PERTURBATION_MAGNITUDE in settings."
+                )
+
+                if verbosity >= 0:  # Always warn for critical failures
+                    warnings.warn(error_message, RuntimeWarning, stacklevel=2)
+
+                # Continue with a copy of the last valid parameters as
+                # fallback, again keeping the donated buffers distinct.
+                params = jax.tree_util.tree_map(jnp.array, last_valid_params)
+
+        final_params = jax.tree_util.tree_map(
+            lambda leaf: leaf[-1], params_history)
+
+        # The last valid parameters are guaranteed finite by the in-graph
+        # tracking, unlike the scan carry that produced the last row.
+        if not self._is_params_valid(final_params, param_validation_keys):
+            params_history = jax.tree_util.tree_map(
+                lambda leaf, valid_leaf: leaf.at[-1].set(valid_leaf),
+                params_history, last_valid_params)
+            final_params = last_valid_params
+
+        self._params_history_stacked = params_history
+        self._params_history_list = None
+
+        self.set_params(final_params)
+
+    @property
+    def params_history(self):
 
-        self.set_params(params_history[-1])
+        """
+        The parameters obtained from each optimization step, as a list of
+        parameter trees. The stacked storage is unstacked lazily and cached.
+        """
+
+        if self._params_history_stacked is None:
+            return None
+
+        if self._params_history_list is None:
+
+            num_steps = jax.tree_util.tree_leaves(
+                self._params_history_stacked)[0].shape[0]
+
+            self._params_history_list = [
+                jax.tree_util.tree_map(lambda leaf: leaf[idx],
+                                       self._params_history_stacked)
+                for idx in range(num_steps)]
+
+        return self._params_history_list
 
     def get_params_history(self):
         return self.params_history
@@ -366,24 +662,34 @@ class OptimizableSpaceCurve(spacecurve.SpaceCurve):
 
             if ':' not in index:
                 index = int(index)
-                param_value = self.params_history[index]
+                param_value = jax.tree_util.tree_map(
+                    lambda leaf: leaf[index], self._params_history_stacked)
+
+                loss_value, loss_grad_value = \
+                    self._loss_value_and_grad(param_value)
 
                 return {
                     'param_value': param_value,
-                    'loss_value': self.opt_loss(param_value),
-                    'loss_grad_value': self.loss_grad(param_value)}
+                    'loss_value': loss_value,
+                    'loss_grad_value': loss_grad_value}
 
             index = slice(*map(int, index.split(':')))
-            param_value = jnp.array(self.params_history[index])
+            param_value = jax.tree_util.tree_map(
+                lambda leaf: leaf[index], self._params_history_stacked)
+
+            loss_value, loss_grad_value = \
+                self._loss_value_and_grad_vmap(param_value)
+
             return {
                 'param_value': param_value,
-                'loss_value': jax.vmap(self.opt_loss)(param_value),
-                'loss_grad_value': jax.vmap(self.loss_grad)(param_value)}
+                'loss_value': loss_value,
+                'loss_grad_value': loss_grad_value}
 
         return super().__getitem__(index)
 
     def update_params_from_opt_history(self, opt_step=-1):
-        self.set_params(self.params_history[opt_step])
+        self.set_params(jax.tree_util.tree_map(
+            lambda leaf: leaf[opt_step], self._params_history_stacked))
 
 
 class BarqCurve(OptimizableSpaceCurve):
@@ -632,7 +938,7 @@ class BarqCurve(OptimizableSpaceCurve):
         
         # 3. Generate target points using optimization grid (OPT_POINTS)
         # This ensures compatibility with prepare_optimization_loss infrastructure
-        n_opt_points = settings.options['OPT_POINTS']
+        n_opt_points = int(settings.options['OPT_POINTS'])
         target_points_opt = self._generate_target_points_for_optimization(
             target_curve, target_points, n_opt_points)
         
@@ -794,8 +1100,8 @@ class BarqCurve(OptimizableSpaceCurve):
         # Traditional random initialization (original behavior)
         if init_free_points is None:
             init_free_points = rng.standard_normal((self.n_free_points, 3))
-            init_free_points = \
-                init_free_points/numpy.linalg.norm(init_free_points, axis=0)
+            init_free_points = init_free_points/numpy.linalg.norm(
+                init_free_points, axis=1, keepdims=True)
 
             init_free_points = jnp.array(init_free_points)
 
@@ -839,15 +1145,20 @@ class BarqCurve(OptimizableSpaceCurve):
         contain the control points used in BARQ.
         """
 
-        points = self.get_bezier_control_points()
-        barq_angle = self.params['pgf_params']['barq_angle']
+        # A single transfer moves the points off the device before the
+        # file is assembled on the host.
+        points = numpy.asarray(self.get_bezier_control_points())
+        barq_angle = numpy.asarray(
+            self.params['pgf_params']['barq_angle']).item()
 
         # We add the first line to store the binormal angle for the TTC.
 
-        points = jnp.vstack([
+        points = numpy.vstack([
             [barq_angle, -1., -1.],
             points
         ])
 
-        df = pd.DataFrame(points)
-        df.to_csv(filename, index=False, float_format='%.12f')
\ No newline at end of file
+        # The header matches the default pandas column labels so the file
+        # stays readable by prepare_bezier_from_file.
+        numpy.savetxt(filename, points, fmt='%.12f', delimiter=',',
+                      header='0,1,2', comments='')
\ No newline at end of file
@@ -40,11 +40,19 @@ class Settings:
     options['MAX_POINTS'] = 12
     options['COUNTOUR_LEVELS'] = (-9, -8, -7, -6, -5)
 
+    # Directory for the persistent JAX compilation cache. When set, the
+    # XLA executables for the jitted losses and optimization steps are
+    # stored on disk and reused across sessions.
+    options['JAX_COMPILATION_CACHE_DIR'] = None
+
+    # Number of optimization iterations fused into a single jax.lax.scan.
+    # The progress bar advances once per chunk.
+    options['OPT_CHUNK_ITERS'] = 50
+
     # Numerical stability options for optimization
     options['MAX_OPTIMIZATION_RETRIES'] = 3
     options['PERTURBATION_MAGNITUDE'] = 1e-6
     options['OPTIMIZATION_VERBOSITY'] = 0  # 0=silent, 1=warnings, 2=debug
-    options['NUMERICAL_CHECK_FREQUENCY'] = 1  # Check every N iterations
     # The number of derivatives used for the moving frame.
     # The value is chosen so that inflection points are appropriately handled.
     options['NUM_DERIVS'] = 5
@@ -19,26 +19,26 @@ from qurveros.settings import settings
 
 XGATE_TEST_POINTS = jnp.array([
     [0.0, 0.0, 0.0],
-    [-0.9174368396882462, 0.20027364852868498, 0.21369406409562192],
-    [-0.8041761519991039, 0.17554918775154812, 0.1873128075256522],
-    [1.0143787013738685, 0.17178532468454982, 0.2736775539730863],
-    [0.38083479899988426, 0.5492027916657358, -0.0006194580232775966],
-    [-0.5354359751936735, 0.2523799047994231, 0.17442024487353],
-    [-0.9418994108358996, 0.3539711361917974, -0.232999217817437],
-    [-0.5711036813837912, -0.05713223886502761, 0.0018145161138630609],
-    [-0.1905484142468627, 0.14036688528159752, -0.04564339757313231],
-    [0.21930072573262832, -0.688227292792582, -0.004032082528444142],
-    [0.3428011852341114, -0.4263672394739059, -0.4215955544900982],
-    [0.13930670327019212, -0.43162490061771347, -0.18005032077844998],
-    [0.2537454430731247, -0.07892925578860352, -0.3437089732582968],
-    [0.6188165455173736, 0.2788967540319768, -0.1954681209080432],
-    [0.23319152157880507, 0.22028400307332546, 0.007186201125869842],
-    [0.5468775591637357, -0.27531072025575787, 0.40647697079809975],
-    [0.31340505721501555, 0.24480221323268164, 0.24650669307439751],
-    [-0.24996005966023707, 0.313430826389596, 0.9184770058348332],
-    [-0.43575661910587743, -0.7757470303594219, -0.417375597747747],
-    [-0.9816177358001005, 0.21428414132133258, 0.2286434054934467],
-    [-0.9016288172030048, 0.19682280569985486, 0.21001197893831114],
+    [0.01301839174224003, 0.19284217844887175, 1.0350018040453655],
+    [0.01303884581952674, 0.1931451658608523, 1.0366279655030162],
+    [0.3969788873206843, -0.7729266361139446, 0.5259052951241866],
+    [0.8253054401899973, 0.41654257790666466, -0.31345927076211233],
+    [-0.9315641632922407, -0.45794515442958694, 0.17067130608501965],
+    [-0.8926316422567648, 0.08199325778722256, -0.3486715171685055],
+    [-0.6837306876569234, -0.3055781532058559, -0.286789193351136],
+    [0.518883570551368, 1.1205645049684791, -0.17004363280882648],
+    [1.061705862159986, -0.39435436365228854, 0.09592655476352119],
+    [0.9420759597429662, -0.04638326331676422, -0.7986533491599517],
+    [-0.7378387014517301, -0.6331319529968216, 0.04144026567783366],
+    [-0.8620337894868597, -0.37245654543991963, -0.2928449046853929],
+    [0.8815297745113156, 0.22302938197965638, 0.44960714317230954],
+    [-0.5480290472849582, -0.1396932780662059, 0.8146096964873871],
+    [0.6942856895845279, -0.47821928970931415, 0.824791317281614],
+    [0.919759268395445, 0.5432685357162299, 0.4881815794502526],
+    [-0.12356578845105093, 0.6565750309860285, 1.0696216251873503],
+    [-0.359542579866349, 0.8733161127860123, -0.14943496987653004],
+    [0.009173184101668171, 0.13588289863321204, 0.7292960821928053],
+    [0.008004138494651022, 0.11856575946372507, 0.6363533949368859],
     [0.0, 0.0, 0.0]])
 
 
@@ -240,6 +240,35 @@ class NumericalStabilityTestCase(unittest.TestCase):
             settings.options['MAX_OPTIMIZATION_RETRIES'] = original_retries
             settings.options['NUMERICAL_CHECK_FREQUENCY'] = original_check_freq
 
+    def test_recovery_with_check_frequency_above_one(self):
+        """
+        The in-graph substitution must keep the scan state finite on every
+        iteration, regardless of the legacy NUMERICAL_CHECK_FREQUENCY
+        setting. With jax_debug_nans enabled package-wide, any NaN that
+        leaks into the scan outputs aborts the run with a
+        FloatingPointError.
+        """
+
+        original_check_freq = settings.options.get(
+            'NUMERICAL_CHECK_FREQUENCY', 1)
+
+        try:
+            settings.options['NUMERICAL_CHECK_FREQUENCY'] = 100
+
+            self.optspacecurve.initialize_parameters(jnp.array([0.5]))
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                self.optspacecurve.optimize(
+                    optimizer=optax.scale(-10.0), max_iter=20)
+
+            final_params = self.optspacecurve.get_params()
+            self.assertTrue(jnp.all(jnp.isfinite(final_params)),
+                            f"Final parameters are not finite: {final_params}")
+
+        finally:
+            settings.options['NUMERICAL_CHECK_FREQUENCY'] = original_check_freq
+
     def test_parameter_validation(self):
         """Test the parameter validation functions directly"""
         
@@ -254,6 +283,19 @@ class NumericalStabilityTestCase(unittest.TestCase):
         invalid_params = jnp.array([jnp.inf, 2.0, 3.0])
         self.assertFalse(self.optspacecurve._is_params_valid(invalid_params))
 
+    def test_infinite_initial_params_raise_runtime_error(self):
+        """
+        Infinite initial parameters must raise the documented RuntimeError.
+        The eager validation path must not manufacture a NaN from the Inf,
+        which would abort with a FloatingPointError under the package-wide
+        jax_debug_nans configuration.
+        """
+
+        self.optspacecurve.initialize_parameters(jnp.array([jnp.inf]))
+
+        with self.assertRaises(RuntimeError):
+            self.optspacecurve.optimize(max_iter=5)
+
     def test_parameter_perturbation(self):
         """Test that parameter perturbation works correctly"""
         
@@ -271,6 +313,75 @@ class NumericalStabilityTestCase(unittest.TestCase):
         diff = jnp.abs(perturbed - base_params)
         self.assertTrue(jnp.all(diff > 0))  # Should be different
         self.assertTrue(jnp.all(diff < 1e-2))  # But not too different
+class LossPreparationCacheTestCase(unittest.TestCase):
+    """
+    Tests that re-preparing a logically identical loss reuses the
+    compiled callables instead of re-tracing them.
+    """
+
+    def setUp(self):
+
+        def simple_curve(x, params):
+            scale = params[0]
+            return jnp.array([jnp.cos(scale * x), jnp.sin(scale * x), 0])
+
+        self.optspacecurve = OptimizableSpaceCurve(
+            curve=simple_curve,
+            order=0,
+            interval=[0, 2*jnp.pi]
+        )
+
+        def quadratic_loss(frenet_dict):
+            return jnp.sum(frenet_dict['curvature']**2)
+
+        self.loss = quadratic_loss
+
+    def test_opt_points_round_trip_reuses_compiled_losses(self):
+        """
+        Toggling OPT_POINTS between preparations must restore the
+        compiled loss set for each previously seen value, so notebook
+        round-trips through the settings do not re-trace the loss.
+        """
+
+        original_opt_points = settings.options['OPT_POINTS']
+
+        try:
+            settings.options['OPT_POINTS'] = 64
+            self.optspacecurve.prepare_optimization_loss([self.loss, 1.0])
+            coarse_loss = self.optspacecurve.opt_loss
+
+            settings.options['OPT_POINTS'] = 128
+            self.optspacecurve.prepare_optimization_loss([self.loss, 1.0])
+            fine_loss = self.optspacecurve.opt_loss
+            self.assertIsNot(fine_loss, coarse_loss)
+
+            settings.options['OPT_POINTS'] = 64
+            self.optspacecurve.prepare_optimization_loss([self.loss, 1.0])
+            self.assertIs(self.optspacecurve.opt_loss, coarse_loss)
+
+            settings.options['OPT_POINTS'] = 128
+            self.optspacecurve.prepare_optimization_loss([self.loss, 1.0])
+            self.assertIs(self.optspacecurve.opt_loss, fine_loss)
+
+        finally:
+            settings.options['OPT_POINTS'] = original_opt_points
+
+    def test_identical_preparation_reuses_compiled_losses(self):
+        """Repeated identical preparations must return the same callables."""
+
+        self.optspacecurve.prepare_optimization_loss([self.loss, 1.0])
+        first_loss = self.optspacecurve.opt_loss
+        first_grad = self.optspacecurve.loss_grad
+
+        self.optspacecurve.prepare_optimization_loss([self.loss, 1.0])
+        self.assertIs(self.optspacecurve.opt_loss, first_loss)
+        self.assertIs(self.optspacecurve.loss_grad, first_grad)
+
+        # A different weight describes a different loss.
+        self.optspacecurve.prepare_optimization_loss([self.loss, 2.0])
+        self.assertIsNot(self.optspacecurve.opt_loss, first_loss)
+
+
 class BarqCurveFittingTestCase(unittest.TestCase):
     """
     Tests for the curve fitting functionality in BarqCurve.